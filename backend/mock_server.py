@@ -11,20 +11,24 @@ import io
 import wave
 import numpy as np
 import json
+import re
 import time
-import pyttsx3
-from gtts import gTTS
 import edge_tts
 import asyncio
 import tempfile
 import os
 import requests
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional
 
 _default_front_dist = os.path.abspath(
     os.path.join(os.path.dirname(__file__), '..', 'frontend', 'dist')
 )
 FRONT_DIST_PATH = os.getenv('FRONT_DIST_PATH', _default_front_dist)
 FRONT_DIST_PATH = os.path.abspath(FRONT_DIST_PATH)
+FRONT_INDEX_PATH = os.path.join(FRONT_DIST_PATH, 'index.html')
 
 app = Flask(
     __name__,
@@ -44,80 +48,92 @@ AVAILABLE_DIALECTS = [
     'kansai', 'hakata', 'tsugaru'
 ]
 
-def improve_kanji_reading(text: str) -> str:
-    """漢字の読み方を改善するための前処理"""
-    # よく間違えられる漢字の読み方を修正
-    replacements = {
-        # 数字の読み方
-        '1': 'いち',
-        '2': 'に',
-        '3': 'さん',
-        '4': 'よん',
-        '5': 'ご',
-        '6': 'ろく',
-        '7': 'なな',
-        '8': 'はち',
-        '9': 'きゅう',
-        '0': 'ゼロ',
-        
-        # よく使われる漢字の読み方修正
-        '今日': 'きょう',
-        '明日': 'あした',
-        '昨日': 'きのう',
-        '今': 'いま',
-        '時': 'とき',
-        '分': 'ふん',
-        '秒': 'びょう',
-        '年': 'ねん',
-        '月': 'がつ',
-        '日': 'にち',
-        '曜日': 'ようび',
-        '時間': 'じかん',
-        '分間': 'ふんかん',
-        '秒間': 'びょうかん',
-        '年間': 'ねんかん',
-        '月間': 'げっかん',
-        '日間': 'にちかん',
-        
-        # 天気関連
-        '天気': 'てんき',
-        '晴れ': 'はれ',
-        '雨': 'あめ',
-        '雪': 'ゆき',
-        '曇り': 'くもり',
-        '風': 'かぜ',
-        '暑い': 'あつい',
-        '寒い': 'さむい',
-        '暖かい': 'あたたかい',
-        '涼しい': 'すずしい',
-        
-        # 挨拶
-        'おはよう': 'おはよう',
-        'こんにちは': 'こんにちは',
-        'こんばんは': 'こんばんは',
-        'ありがとう': 'ありがとう',
-        'すみません': 'すみません',
-        'ごめんなさい': 'ごめんなさい',
-        
-        # 場所
-        '東京': 'とうきょう',
-        '大阪': 'おおさか',
-        '京都': 'きょうと',
-        '名古屋': 'なごや',
-        '福岡': 'ふくおか',
-        '札幌': 'さっぽろ',
-        '仙台': 'せんだい',
-        '広島': 'ひろしま',
-        '鹿児島': 'かごしま',
-        '沖縄': 'おきなわ',
-    }
+# よく誤読される漢字・数字の読み方
+KANJI_READINGS = {
+    # 数字の読み方
+    '1': 'いち',
+    '2': 'に',
+    '3': 'さん',
+    '4': 'よん',
+    '5': 'ご',
+    '6': 'ろく',
+    '7': 'なな',
+    '8': 'はち',
+    '9': 'きゅう',
+    '0': 'ゼロ',
+    
+    # よく使われる漢字の読み方修正
+    '今日': 'きょう',
+    '明日': 'あした',
+    '昨日': 'きのう',
+    '今': 'いま',
+    '時': 'とき',
+    '分': 'ふん',
+    '秒': 'びょう',
+    '年': 'ねん',
+    '月': 'がつ',
+    '日': 'にち',
+    '曜日': 'ようび',
+    '時間': 'じかん',
+    '分間': 'ふんかん',
+    '秒間': 'びょうかん',
+    '年間': 'ねんかん',
+    '月間': 'げっかん',
+    '日間': 'にちかん',
+    
+    # 天気関連
+    '天気': 'てんき',
+    '晴れ': 'はれ',
+    '雨': 'あめ',
+    '雪': 'ゆき',
+    '曇り': 'くもり',
+    '風': 'かぜ',
+    '暑い': 'あつい',
+    '寒い': 'さむい',
+    '暖かい': 'あたたかい',
+    '涼しい': 'すずしい',
     
-    # 置換を実行
-    result = text
-    for kanji, reading in replacements.items():
-        result = result.replace(kanji, reading)
+    # 挨拶
+    'おはよう': 'おはよう',
+    'こんにちは': 'こんにちは',
+    'こんばんは': 'こんばんは',
+    'ありがとう': 'ありがとう',
+    'すみません': 'すみません',
+    'ごめんなさい': 'ごめんなさい',
     
-    return result
+    # 場所
+    '東京': 'とうきょう',
+    '大阪': 'おおさか',
+    '京都': 'きょうと',
+    '名古屋': 'なごや',
+    '福岡': 'ふくおか',
+    '札幌': 'さっぽろ',
+    '仙台': 'せんだい',
+    '広島': 'ひろしま',
+    '鹿児島': 'かごしま',
+    '沖縄': 'おきなわ',
+}
+
+# 他の語に含まれない1文字の読み（数字など）は、正規表現での置換後に str.translate で一括変換する
+_SINGLE_CHAR_READINGS = {
+    kanji: reading for kanji, reading in KANJI_READINGS.items()
+    if len(kanji) == 1 and not any(kanji in other for other in KANJI_READINGS if other != kanji)
+}
+_KANJI_READING_TABLE = str.maketrans(_SINGLE_CHAR_READINGS)
+
+# 残りは長い語を優先して一度の走査で置換するための正規表現（例: 「曜日」を「日」より先に照合）
+_KANJI_READING_PATTERN = re.compile(
+    '|'.join(
+        re.escape(kanji) for kanji in sorted(KANJI_READINGS, key=len, reverse=True)
+        if kanji not in _SINGLE_CHAR_READINGS
+    )
+)
+
+def improve_kanji_reading(text: str) -> str:
+    """漢字の読み方を改善するための前処理"""
+    # 正規表現の置換を先に行う（読みの結合で別の語ができる連鎖置換を防ぐ）
+    text = _KANJI_READING_PATTERN.sub(lambda m: KANJI_READINGS[m.group(0)], text)
+    return text.translate(_KANJI_READING_TABLE)
 
 def convert_to_browser_compatible_wav(audio_data: bytes) -> bytes:
     """WAVファイルをブラウザ互換形式に変換"""
@@ -151,17 +167,25 @@ def convert_to_browser_compatible_wav(audio_data: bytes) -> bytes:
 
 def generate_standard_wav(audio_data: bytes) -> bytes:
     """標準的なWAVファイルを生成"""
+    # 入力に依存しない固定音なので、一度生成したものを使い回す
+    return _build_standard_wav()
+
+@lru_cache(maxsize=1)
+def _build_standard_wav() -> bytes:
+    """440Hzの固定音をWAVとして生成"""
     sample_rate = 22050
     duration = 2.0  # 2秒の音声
     samples = int(sample_rate * duration)
     
     # シンプルな音声を生成
     t = np.linspace(0, duration, samples, False)
-    wave_data = 0.3 * np.sin(2 * np.pi * 440 * t)  # 440Hzの音
+    wave_data = np.sin(2 * np.pi * 440 * t)  # 440Hzの音
+    wave_data *= 0.3
     
-    # 16bit PCMに変換
-    wave_data = np.clip(wave_data, -1.0, 1.0)
-    wave_data = (wave_data * 32767).astype(np.int16)
+    # 16bit PCMに変換（一時配列を作らずその場で処理）
+    np.clip(wave_data, -1.0, 1.0, out=wave_data)
+    wave_data *= 32767
+    wave_data = wave_data.astype(np.int16)
     
     # WAVファイルとして出力
     buffer = io.BytesIO()
@@ -173,6 +197,89 @@ def generate_standard_wav(audio_data: bytes) -> bytes:
     
     return buffer.getvalue()
 
+# Edge TTSで生成した音声のキャッシュ（(方言, テキスト) -> 音声データ、LRU）
+TTS_CACHE_MAX_ENTRIES = 128
+_tts_audio_cache: 'OrderedDict[tuple, bytes]' = OrderedDict()
+_tts_audio_cache_lock = threading.Lock()
+
+def _get_cached_tts_audio(key: tuple) -> Optional[bytes]:
+    """キャッシュ済みの音声データを取得"""
+    with _tts_audio_cache_lock:
+        audio_data = _tts_audio_cache.get(key)
+        if audio_data is not None:
+            _tts_audio_cache.move_to_end(key)
+        return audio_data
+
+def _store_cached_tts_audio(key: tuple, audio_data: bytes) -> None:
+    """音声データをキャッシュに保存し、上限を超えたら古いものから破棄"""
+    with _tts_audio_cache_lock:
+        _tts_audio_cache[key] = audio_data
+        _tts_audio_cache.move_to_end(key)
+        while len(_tts_audio_cache) > TTS_CACHE_MAX_ENTRIES:
+            _tts_audio_cache.popitem(last=False)
+
+# 方言に応じたEdge TTSの音声（より自然な読み方をする音声を選択）
+EDGE_TTS_VOICES = {
+    'standard': 'ja-JP-MayuNeural',    # 女性声（より自然な読み方）
+    'tokyo': 'ja-JP-MayuNeural',       # 女性声（東京）
+    'osaka': 'ja-JP-KeitaNeural',      # 男性声（関西弁）
+    'kyoto': 'ja-JP-AoiNeural',        # 女性声（京都弁）
+    'hiroshima': 'ja-JP-KeitaNeural',  # 男性声（広島弁）
+    'fukuoka': 'ja-JP-KeitaNeural',    # 男性声（博多弁）
+    'sendai': 'ja-JP-AoiNeural',       # 女性声（仙台弁）
+    'nagoya': 'ja-JP-MayuNeural',      # 女性声（名古屋弁）
+    'sapporo': 'ja-JP-AoiNeural',      # 女性声（札幌弁）
+    'okinawa': 'ja-JP-KeitaNeural',    # 男性声（沖縄弁）
+    'kagoshima': 'ja-JP-KeitaNeural',  # 男性声（鹿児島弁）
+    'kansai': 'ja-JP-KeitaNeural',     # 男性声（関西弁）
+    'hakata': 'ja-JP-KeitaNeural',     # 男性声（博多弁）
+    'tsugaru': 'ja-JP-AoiNeural',      # 女性声（津軽弁）
+}
+
+# 方言に応じたEdge TTSの音声スタイルと速度
+EDGE_TTS_STYLES = {
+    'standard': {'rate': '+0%', 'pitch': '+0Hz'},
+    'tokyo': {'rate': '+0%', 'pitch': '+0Hz'},
+    'osaka': {'rate': '+10%', 'pitch': '+20Hz'},
+    'kyoto': {'rate': '-10%', 'pitch': '-10Hz'},
+    'hiroshima': {'rate': '+5%', 'pitch': '+10Hz'},
+    'fukuoka': {'rate': '-5%', 'pitch': '-5Hz'},
+    'sendai': {'rate': '-10%', 'pitch': '-10Hz'},
+    'nagoya': {'rate': '+0%', 'pitch': '+0Hz'},
+    'sapporo': {'rate': '-15%', 'pitch': '-15Hz'},
+    'okinawa': {'rate': '+15%', 'pitch': '+30Hz'},
+    'kagoshima': {'rate': '+5%', 'pitch': '+5Hz'},
+    'kansai': {'rate': '+10%', 'pitch': '+20Hz'},
+    'hakata': {'rate': '-5%', 'pitch': '-5Hz'},
+    'tsugaru': {'rate': '-15%', 'pitch': '-15Hz'},
+}
+
+# 方言に応じたpyttsx3の音声の速度とピッチ
+PYTTSX3_SETTINGS = {
+    'standard': {'rate': 200, 'pitch': 0.5},
+    'tokyo': {'rate': 200, 'pitch': 0.5},
+    'osaka': {'rate': 220, 'pitch': 0.7},
+    'kyoto': {'rate': 180, 'pitch': 0.3},
+    'hiroshima': {'rate': 210, 'pitch': 0.6},
+    'fukuoka': {'rate': 190, 'pitch': 0.4},
+    'sendai': {'rate': 185, 'pitch': 0.3},
+    'nagoya': {'rate': 195, 'pitch': 0.4},
+    'sapporo': {'rate': 175, 'pitch': 0.2},
+    'okinawa': {'rate': 240, 'pitch': 0.8},
+    'kagoshima': {'rate': 205, 'pitch': 0.5},
+    'kansai': {'rate': 220, 'pitch': 0.7},
+    'hakata': {'rate': 190, 'pitch': 0.4},
+    'tsugaru': {'rate': 175, 'pitch': 0.2},
+}
+
+# 方言に応じたフォールバック音の基本周波数
+FALLBACK_BASE_FREQS = {
+    'standard': 200, 'tokyo': 200, 'osaka': 220, 'kyoto': 180,
+    'hiroshima': 210, 'fukuoka': 190, 'sendai': 185, 'nagoya': 195,
+    'sapporo': 175, 'okinawa': 240, 'kagoshima': 205,
+    'kansai': 220, 'hakata': 190, 'tsugaru': 175,
+}
+
 def generate_real_tts_audio(text: str, dialect: str) -> bytes:
     """実際のTTSを使用して音声を生成"""
     try:
@@ -185,46 +292,16 @@ def generate_real_tts_audio(text: str, dialect: str) -> bytes:
 
 async def generate_edge_tts_audio(text: str, dialect: str) -> bytes:
     """Microsoft Edge TTSを使用して高品質な音声を生成"""
+    # 同じ文言・方言の再生成を避ける（フォールバック音声はキャッシュしない）
+    cache_key = (dialect, text)
+    cached_audio = _get_cached_tts_audio(cache_key)
+    if cached_audio is not None:
+        return cached_audio
+    
     try:
-        # 方言に応じた音声設定（より自然な読み方をする音声を選択）
-        voice_mapping = {
-            'standard': 'ja-JP-MayuNeural',    # 女性声（より自然な読み方）
-            'tokyo': 'ja-JP-MayuNeural',       # 女性声（東京）
-            'osaka': 'ja-JP-KeitaNeural',      # 男性声（関西弁）
-            'kyoto': 'ja-JP-AoiNeural',        # 女性声（京都弁）
-            'hiroshima': 'ja-JP-KeitaNeural',  # 男性声（広島弁）
-            'fukuoka': 'ja-JP-KeitaNeural',    # 男性声（博多弁）
-            'sendai': 'ja-JP-AoiNeural',       # 女性声（仙台弁）
-            'nagoya': 'ja-JP-MayuNeural',      # 女性声（名古屋弁）
-            'sapporo': 'ja-JP-AoiNeural',      # 女性声（札幌弁）
-            'okinawa': 'ja-JP-KeitaNeural',    # 男性声（沖縄弁）
-            'kagoshima': 'ja-JP-KeitaNeural',  # 男性声（鹿児島弁）
-            'kansai': 'ja-JP-KeitaNeural',     # 男性声（関西弁）
-            'hakata': 'ja-JP-KeitaNeural',     # 男性声（博多弁）
-            'tsugaru': 'ja-JP-AoiNeural',      # 女性声（津軽弁）
-        }
+        voice = EDGE_TTS_VOICES.get(dialect, 'ja-JP-NanamiNeural')
         
-        voice = voice_mapping.get(dialect, 'ja-JP-NanamiNeural')
-        
-        # 方言に応じた音声スタイルと速度を設定
-        style_settings = {
-            'standard': {'rate': '+0%', 'pitch': '+0Hz'},
-            'tokyo': {'rate': '+0%', 'pitch': '+0Hz'},
-            'osaka': {'rate': '+10%', 'pitch': '+20Hz'},
-            'kyoto': {'rate': '-10%', 'pitch': '-10Hz'},
-            'hiroshima': {'rate': '+5%', 'pitch': '+10Hz'},
-            'fukuoka': {'rate': '-5%', 'pitch': '-5Hz'},
-            'sendai': {'rate': '-10%', 'pitch': '-10Hz'},
-            'nagoya': {'rate': '+0%', 'pitch': '+0Hz'},
-            'sapporo': {'rate': '-15%', 'pitch': '-15Hz'},
-            'okinawa': {'rate': '+15%', 'pitch': '+30Hz'},
-            'kagoshima': {'rate': '+5%', 'pitch': '+5Hz'},
-            'kansai': {'rate': '+10%', 'pitch': '+20Hz'},
-            'hakata': {'rate': '-5%', 'pitch': '-5Hz'},
-            'tsugaru': {'rate': '-15%', 'pitch': '-15Hz'},
-        }
-        
-        settings = style_settings.get(dialect, {'rate': '+0%', 'pitch': '+0Hz'})
+        settings = EDGE_TTS_STYLES.get(dialect, {'rate': '+0%', 'pitch': '+0Hz'})
         
         # 漢字の読み方を改善するための前処理
         processed_text = improve_kanji_reading(text)
@@ -232,81 +309,71 @@ async def generate_edge_tts_audio(text: str, dialect: str) -> bytes:
         # Edge TTSで音声を生成
         communicate = edge_tts.Communicate(processed_text, voice)
         
-        # 一時ファイルに音声を保存
-        with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as temp_file:
-            temp_path = temp_file.name
-        
-        await communicate.save(temp_path)
-        
-        # 音声ファイルを読み込み
-        with open(temp_path, 'rb') as f:
-            audio_data = f.read()
-        
-        # 一時ファイルを削除
-        os.unlink(temp_path)
+        # 一時ファイルを介さず、ストリームから音声データをメモリ上に集める
+        audio_buffer = io.BytesIO()
+        async for chunk in communicate.stream():
+            if chunk['type'] == 'audio':
+                audio_buffer.write(chunk['data'])
+        audio_data = audio_buffer.getvalue()
+        if not audio_data:
+            raise RuntimeError('Edge TTS returned no audio')
         
         # MP3をWAVに変換
-        return convert_mp3_to_wav(audio_data)
+        audio_data = convert_mp3_to_wav(audio_data)
+        _store_cached_tts_audio(cache_key, audio_data)
+        return audio_data
         
     except Exception as e:
         print(f"Edge TTS Error: {e}")
         # フォールバック：pyttsx3を使用
         return generate_pyttsx3_audio(text, dialect)
 
+# pyttsx3の共有エンジンを同時に使わないためのロック
+_pyttsx3_lock = threading.Lock()
+
 def generate_pyttsx3_audio(text: str, dialect: str) -> bytes:
     """pyttsx3を使用して音声を生成（フォールバック）"""
     try:
-        # pyttsx3を使用して音声を生成
-        engine = pyttsx3.init()
-        
-        # 方言に応じた音声設定
-        voices = engine.getProperty('voices')
-        if voices:
-            # 日本語の音声を選択（利用可能な場合）
-            for voice in voices:
-                if 'japanese' in voice.name.lower() or 'ja' in voice.id.lower():
-                    engine.setProperty('voice', voice.id)
-                    break
-        
-        # 音声の速度とピッチを調整
-        dialect_settings = {
-            'standard': {'rate': 200, 'pitch': 0.5},
-            'tokyo': {'rate': 200, 'pitch': 0.5},
-            'osaka': {'rate': 220, 'pitch': 0.7},
-            'kyoto': {'rate': 180, 'pitch': 0.3},
-            'hiroshima': {'rate': 210, 'pitch': 0.6},
-            'fukuoka': {'rate': 190, 'pitch': 0.4},
-            'sendai': {'rate': 185, 'pitch': 0.3},
-            'nagoya': {'rate': 195, 'pitch': 0.4},
-            'sapporo': {'rate': 175, 'pitch': 0.2},
-            'okinawa': {'rate': 240, 'pitch': 0.8},
-            'kagoshima': {'rate': 205, 'pitch': 0.5},
-            'kansai': {'rate': 220, 'pitch': 0.7},
-            'hakata': {'rate': 190, 'pitch': 0.4},
-            'tsugaru': {'rate': 175, 'pitch': 0.2},
-        }
-        
-        settings = dialect_settings.get(dialect, {'rate': 200, 'pitch': 0.5})
-        engine.setProperty('rate', settings['rate'])
-        # ピッチ調整をスキップ（NSSSでサポートされていない場合がある）
-        try:
-            engine.setProperty('pitch', settings['pitch'])
-        except:
-            print("Pitch adjustment not supported, using default")
-        
-        # 一時ファイルに音声を保存
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-            temp_path = temp_file.name
-        
-        engine.save_to_file(text, temp_path)
-        engine.runAndWait()
-        
-        # 音声ファイルを読み込み
-        with open(temp_path, 'rb') as f:
-            audio_data = f.read()
-        
-        # 一時ファイルを削除
-        os.unlink(temp_path)
+        # pyttsx3.init() はプロセス内で共有のエンジンを返すため、スレッド間で
+        # 設定や読み上げキューが混ざらないよう一連の処理を排他的に行う
+        with _pyttsx3_lock:
+            # フォールバック時にのみ必要なため、起動時ではなく使用時に読み込む
+            import pyttsx3
+            
+            # pyttsx3を使用して音声を生成
+            engine = pyttsx3.init()
+            
+            # 方言に応じた音声設定
+            voices = engine.getProperty('voices')
+            if voices:
+                # 日本語の音声を選択（利用可能な場合）
+                for voice in voices:
+                    if 'japanese' in voice.name.lower() or 'ja' in voice.id.lower():
+                        engine.setProperty('voice', voice.id)
+                        break
+            
+            # 音声の速度とピッチを調整
+            settings = PYTTSX3_SETTINGS.get(dialect, {'rate': 200, 'pitch': 0.5})
+            engine.setProperty('rate', settings['rate'])
+            # ピッチ調整をスキップ（NSSSでサポートされていない場合がある）
+            try:
+                engine.setProperty('pitch', settings['pitch'])
+            except:
+                print("Pitch adjustment not supported, using default")
+            
+            # 一時ファイルに音声を保存
+            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
+                temp_path = temp_file.name
+            
+            engine.save_to_file(text, temp_path)
+            engine.runAndWait()
+            
+            # 音声ファイルを読み込み
+            with open(temp_path, 'rb') as f:
+                audio_data = f.read()
+            
+            # 一時ファイルを削除
+            os.unlink(temp_path)
         
         # WAVファイルをブラウザ互換形式に変換
         return convert_to_browser_compatible_wav(audio_data)
@@ -319,21 +386,16 @@ def generate_pyttsx3_audio(text: str, dialect: str) -> bytes:
 def generate_gtts_audio(text: str, dialect: str) -> bytes:
     """Google Text-to-Speechを使用して音声を生成"""
     try:
+        # フォールバック時にのみ必要なため、起動時ではなく使用時に読み込む
+        from gtts import gTTS
+        
         # gTTSを使用して音声を生成
         tts = gTTS(text=text, lang='ja', slow=False)
         
-        # 一時ファイルに音声を保存
-        with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as temp_file:
-            temp_path = temp_file.name
-        
-        tts.save(temp_path)
-        
-        # MP3ファイルを読み込み
-        with open(temp_path, 'rb') as f:
-            audio_data = f.read()
-        
-        # 一時ファイルを削除
-        os.unlink(temp_path)
+        # 一時ファイルを介さずメモリ上に書き出す
+        audio_buffer = io.BytesIO()
+        tts.write_to_fp(audio_buffer)
+        audio_data = audio_buffer.getvalue()
         
         # MP3をWAVに変換してブラウザ互換にする
         return convert_mp3_to_wav(audio_data)
@@ -345,75 +407,58 @@ def generate_gtts_audio(text: str, dialect: str) -> bytes:
 
 def convert_mp3_to_wav(mp3_data: bytes) -> bytes:
     """MP3ファイルをWAVファイルに変換"""
-    try:
-        # 一時ファイルにMP3を保存
-        with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as temp_mp3:
-            temp_mp3.write(mp3_data)
-            temp_mp3_path = temp_mp3.name
-        
-        # WAVファイルに変換
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_wav:
-            temp_wav_path = temp_wav.name
-        
-        # 実際のMP3ファイルをそのまま使用（ブラウザでMP3を再生可能）
-        # MP3ファイルをそのまま返す
-        with open(temp_mp3_path, 'rb') as f:
-            mp3_data = f.read()
-        
-        # 一時ファイルを削除
-        os.unlink(temp_mp3_path)
-        if os.path.exists(temp_wav_path):
-            os.unlink(temp_wav_path)
-        
-        return mp3_data
-        
-    except Exception as e:
-        print(f"MP3 to WAV conversion error: {e}")
-        # フォールバック：標準的なWAVファイルを生成
-        return generate_standard_wav(b'')
-
-def generate_simple_audio(text: str, dialect: str) -> bytes:
-    """シンプルな音声生成（フォールバック）"""
-    sample_rate = 22050
-    duration = max(1.0, len(text) * 0.2)
-    samples = int(sample_rate * duration)
-    
-    # 方言に応じた基本周波数
-    dialect_freqs = {
-        'standard': 200, 'tokyo': 200, 'osaka': 220, 'kyoto': 180,
-        'hiroshima': 210, 'fukuoka': 190, 'sendai': 185, 'nagoya': 195,
-        'sapporo': 175, 'okinawa': 240, 'kagoshima': 205,
-        'kansai': 220, 'hakata': 190, 'tsugaru': 175,
-    }
-    
-    base_freq = dialect_freqs.get(dialect, 200)
-    t = np.linspace(0, duration, samples, False)
-    
-    # より自然な音声を生成
-    wave_data = np.zeros(samples)
+    # 実際のMP3ファイルをそのまま使用（ブラウザでMP3を再生可能）
+    # 内容は変わらないため、一時ファイルへの書き出し・読み戻しは行わない
+    return mp3_data
+
+# フォールバック音のサンプリングレート
+FALLBACK_SAMPLE_RATE = 22050
+
+# 0.3·e^(-2t) のエンベロープにより、約4.6秒以降は16bit PCMで完全に0になる。
+# テンプレートはそれを少し上回る長さだけ生成し、残りは無音で埋める
+FALLBACK_TONE_AUDIBLE_SECONDS = 5.0
+
+@lru_cache(maxsize=16)
+def _simple_audio_template(base_freq: int) -> np.ndarray:
+    """基本周波数ごとのフォールバック音（減衰して無音になるまでの16bit PCM）"""
+    samples = int(FALLBACK_SAMPLE_RATE * FALLBACK_TONE_AUDIBLE_SECONDS)
+    t = np.arange(samples, dtype=np.float32) / FALLBACK_SAMPLE_RATE
     
     # 基本周波数と倍音
-    wave_data += 0.5 * np.sin(2 * np.pi * base_freq * t)
-    wave_data += 0.3 * np.sin(2 * np.pi * base_freq * 2 * t)
-    wave_data += 0.2 * np.sin(2 * np.pi * base_freq * 3 * t)
+    # sin(kθ) を複素フェーザ e^{iθ} の累乗の虚部として求め、超越関数の評価を1回にまとめる
+    phasor = np.exp(1j * 2 * np.pi * base_freq * t)
+    phasor2 = phasor * phasor
+    wave_data = 0.5 * phasor.imag + 0.3 * phasor2.imag + 0.2 * (phasor2 * phasor).imag
     
-    # エンベロープを適用
+    # エンベロープと音量（0.3倍）をまとめて適用
     envelope = np.exp(-t * 2)
+    envelope *= 0.3
     wave_data *= envelope
     
-    # 音量を調整
-    wave_data = wave_data * 0.3
+    # 16bit PCMに変換（一時配列を作らずその場で処理）
+    np.clip(wave_data, -1.0, 1.0, out=wave_data)
+    wave_data *= 32767
+    template = wave_data.astype(np.int16)
+    template.flags.writeable = False
+    return template
+
+def generate_simple_audio(text: str, dialect: str) -> bytes:
+    """シンプルな音声生成（フォールバック）"""
+    duration = max(1.0, len(text) * 0.2)
+    samples = int(FALLBACK_SAMPLE_RATE * duration)
     
-    # 16bit PCMに変換
-    wave_data = np.clip(wave_data, -1.0, 1.0)
-    wave_data = (wave_data * 32767).astype(np.int16)
+    # 方言ごとのテンプレートを切り出し、足りない分は無音で埋める
+    template = _simple_audio_template(FALLBACK_BASE_FREQS.get(dialect, 200))
+    wave_data = np.zeros(samples, dtype=np.int16)
+    audible = min(samples, len(template))
+    wave_data[:audible] = template[:audible]
     
     # WAVファイルとして出力
     buffer = io.BytesIO()
     with wave.open(buffer, 'wb') as wav_file:
         wav_file.setnchannels(1)
         wav_file.setsampwidth(2)
-        wav_file.setframerate(sample_rate)
+        wav_file.setframerate(FALLBACK_SAMPLE_RATE)
         wav_file.writeframes(wave_data.tobytes())
     
     return buffer.getvalue()
@@ -513,6 +558,23 @@ def voice_status():
     })
 
 
+# ElevenLabsへの接続プールをリクエスト間で使い回す（TLSハンドシェイクを毎回行わない）
+# HTTPAdapterの接続プールはスレッドセーフなので、gunicornのスレッド間で共有する
+_elevenlabs_adapter = requests.adapters.HTTPAdapter()
+
+
+def _elevenlabs_session() -> requests.Session:
+    """共有の接続プールを使うリクエスト単位のセッションを作成
+
+    Cookieなどのセッション状態が利用者間で共有されないよう、セッション自体は
+    リクエストごとに作り直す。close() は共有プールまで閉じてしまうため呼ばない。
+    """
+    session = requests.Session()
+    session.mount('https://', _elevenlabs_adapter)
+    session.mount('http://', _elevenlabs_adapter)
+    return session
+
+
 def _is_elevenlabs_configured() -> bool:
     return bool(ELEVENLABS_API_KEY)
 
@@ -541,7 +603,7 @@ def elevenlabs_voices():
         }), 503
 
     try:
-        response = requests.get(
+        response = _elevenlabs_session().get(
             f'{ELEVENLABS_BASE_URL}/voices',
             headers={'xi-api-key': ELEVENLABS_API_KEY},
             timeout=30
@@ -602,7 +664,7 @@ def elevenlabs_text_to_speech():
             payload[field] = data[field]
 
     try:
-        response = requests.post(
+        response = _elevenlabs_session().post(
             f'{ELEVENLABS_BASE_URL}/text-to-speech/{voice_id}',
             headers=_build_elevenlabs_headers(),
             json=payload,
@@ -645,11 +707,14 @@ def google_maps_config():
     })
 
 
+# SPAのフォールバック対象から除外するAPIのルートパス
+API_ROOTS = frozenset({'health', 'dialects', 'voice'})
+
+
 def _serve_index():
     """フロントエンドのindex.htmlを返す"""
-    index_path = os.path.join(app.static_folder or '', 'index.html')
-    if index_path and os.path.exists(index_path):
-        return send_from_directory(app.static_folder, 'index.html')
+    if os.path.isfile(FRONT_INDEX_PATH):
+        return send_from_directory(FRONT_DIST_PATH, 'index.html')
     return jsonify({
         'message': 'Frontend build not found. Please build the frontend assets.'
     }), 404
@@ -659,14 +724,11 @@ def _serve_index():
 @app.route('/<path:path>', methods=['GET'])
 def serve_frontend(path: str):
     """シングルページアプリケーションのための静的ファイル配信"""
-    api_roots = {'health', 'dialects', 'voice'}
-    if path and path.split('/')[0] in api_roots:
+    if path and path.split('/')[0] in API_ROOTS:
         abort(404)
 
-    if path and app.static_folder:
-        candidate = os.path.join(app.static_folder, path)
-        if os.path.isfile(candidate):
-            return send_from_directory(app.static_folder, path)
+    if path and os.path.isfile(os.path.join(FRONT_DIST_PATH, path)):
+        return send_from_directory(FRONT_DIST_PATH, path)
 
     return _serve_index()
 